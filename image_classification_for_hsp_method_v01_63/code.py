@@ -1,12 +1,516 @@
 import numpy as np
-import matplotlib.pyplot as plt
-import matplotlib.patches as patches
-import matplotlib.transforms as transforms
 from PIL import Image
 import os
+import functools
+import hashlib
+from collections import OrderedDict
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from itertools import repeat
 from datetime import datetime
 from scipy.stats import norm, cumfreq
 
+try:
+    from joblib import Memory
+except ImportError:  # Optional: without joblib, results are only cached in memory
+    Memory = None
+
+try:
+    import xxhash
+except ImportError:  # Optional: falls back to hashlib's blake2b for image fingerprints
+    xxhash = None
+
+try:
+    import cv2
+except ImportError:  # Optional: images are decoded with PIL instead
+    cv2 = None
+
+try:
+    from numba import njit, prange
+except ImportError:  # Optional: overlay and row statistics fall back to the NumPy path
+    njit = None
+
+# Per-user on-disk cache location for the results entries (used only when joblib is installed;
+# created on first use, never at import)
+_CACHE_DIR = os.path.join(os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache'),
+                          'image_classification_for_hsp_method')
+
+# FIFO memo of global statistics keyed on image content (see `_global_statistics`)
+_GLOBAL_STATS_CACHE = OrderedDict()
+_GLOBAL_STATS_CACHE_SIZE = 8
+_GLOBAL_STATS_LOCK = threading.Lock()
+
+# Images larger than this (pixels) get their global percentiles estimated from a strided
+# sample of about `_PERCENTILE_SAMPLE_SIZE` pixels instead of counting every pixel
+_PERCENTILE_SAMPLE_THRESHOLD = 1_000_000
+_PERCENTILE_SAMPLE_SIZE = 200_000
+
+# Part of the `_cached_result_entry` cache key (the caches only see that function's own source):
+# bump the version whenever the numerical pipeline behind it changes
+_CACHE_VERSION = (3, _PERCENTILE_SAMPLE_THRESHOLD, _PERCENTILE_SAMPLE_SIZE)
+
+# Contrast Overlay zones: pixel < P_min (Shadows) and pixel > P_max (Highlights)
+_ZONE_NONE, _ZONE_SHADOW, _ZONE_HIGHLIGHT = 0, 1, 2
+# Dark Red (139, 0, 0) for Shadows, Light Red (255, 100, 100) for Highlights
+_ZONE_COLORS = ['#8b0000', '#ff6464']
+
+# Histogram panel (Object 2) invariants: [i, i+1) bins of the 256 intensities and cumulative % ticks
+_BIN_EDGES_256 = np.arange(257)
+_BIN_CENTERS_256 = _BIN_EDGES_256[:-1] + 0.5
+_CUM_TICKS = np.arange(0, 101, 10)
+
+def _lerp(low_vals, high_vals, fraction):
+    r"""
+    Linear interpolation between neighbouring order statistics.
+
+    Mirrors the branches of numpy's internal `_lerp` so the results are bit-identical to
+    `np.percentile` with its default (linear) method.
+    """
+    diff = high_vals - low_vals
+    return np.where(fraction >= 0.5, high_vals - diff * (1.0 - fraction), low_vals + diff * fraction)[()]
+
+def _percentile_indices(n, q):
+    r"""
+    Interpolation positions of percentile(s) `q` over `n` ordered values, as used by
+    `np.percentile` (linear method).
+
+    Returns
+    -------
+    tuple
+        `(positions, lower, upper)`: fractional positions and the indices of the two
+        neighbouring order statistics.
+    """
+    positions = (np.asarray(q, dtype=np.float64) / 100.0) * (n - 1)
+    lower = np.floor(positions).astype(np.intp)
+    upper = np.minimum(lower + 1, n - 1)
+    return positions, lower, upper
+
+def _percentile_from_sorted(sorted_values, q):
+    r"""
+    Reads one or several percentiles from data already sorted along its last axis.
+
+    Uses the same linear interpolation as `np.percentile` (default method), so the values
+    are identical while the data only needs to be sorted once. All requested percentiles
+    are fetched with a single gather of their neighbouring columns. Data partitioned with
+    `np.partition` at the indices from `_percentile_indices` is also valid input.
+
+    Parameters
+    ----------
+    sorted_values : numpy.ndarray
+        Data sorted in ascending order along the last axis (or partitioned at the
+        neighbouring indices of every requested percentile).
+    q : float or sequence of float
+        Percentile(s) in the range [0, 100].
+
+    Returns
+    -------
+    numpy.float64 or numpy.ndarray
+        Percentile value(s). For a sequence `q`, the first axis indexes the percentiles
+        (e.g. `row_p_min, row_median = _percentile_from_sorted(sorted_rows, [10, 50])`).
+    """
+    positions, lower, upper = _percentile_indices(sorted_values.shape[-1], q)
+
+    neighbours = sorted_values[..., np.concatenate((lower.ravel(), upper.ravel()))].astype(np.float64)
+    low_vals, high_vals = np.split(neighbours, 2, axis=-1)
+    values = _lerp(low_vals, high_vals, (positions - lower).ravel())
+    if positions.ndim == 0:
+        return values[..., 0][()]
+    return np.moveaxis(values, -1, 0)
+
+def _percentile_from_cdf(cdf, q):
+    r"""
+    Reads the `q`-th percentile of 8-bit data from the cumulative count of its 256-bin histogram.
+
+    The k-th smallest pixel is the first intensity whose cumulative count exceeds k, so the
+    percentile is exact (same linear interpolation as `np.percentile`) in O(256) instead of
+    sorting every pixel.
+
+    Parameters
+    ----------
+    cdf : numpy.ndarray
+        Cumulative pixel count per intensity (length 256).
+    q : float
+        Percentile in the range [0, 100].
+
+    Returns
+    -------
+    numpy.float64
+        Percentile value.
+    """
+    n = int(cdf[-1])
+    position = (q / 100.0) * (n - 1)
+    lower = int(np.floor(position))
+    upper = min(lower + 1, n - 1)
+
+    low_val = np.float64(np.searchsorted(cdf, lower, side='right'))
+    high_val = np.float64(np.searchsorted(cdf, upper, side='right'))
+    return _lerp(low_val, high_val, position - lower)
+
+def _image_fingerprint(img_array):
+    r"""
+    Fast 64-bit content hash of a contiguous image array (xxh3 if available, else blake2b).
+    """
+    if xxhash is not None:
+        return xxhash.xxh3_64(img_array).intdigest()
+    return hashlib.blake2b(img_array, digest_size=8).digest()
+
+def _global_statistics(img_array, minimum_percentil, maximum_percentil, sample_large=False):
+    r"""
+    Computes the global percentiles and the 256-bin histogram of an 8-bit grayscale image.
+
+    With `sample_large`, for images above `_PERCENTILE_SAMPLE_THRESHOLD` pixels, P_min, P_max
+    and P50 are estimated from a strided sample of ~`_PERCENTILE_SAMPLE_SIZE` pixels (the stride
+    is chosen coprime with the image width so every column is represented) and clamped to the exact
+    [P0, P100] range; a 0 or 100 bound returns the exact extreme. The full histogram is not
+    computed (`hist` and `cdf` are None), so sampling is only worth it when the histogram is
+    not drawn.
+
+    Results are memoized in a small FIFO cache (`_GLOBAL_STATS_CACHE`, last
+    `_GLOBAL_STATS_CACHE_SIZE` entries) keyed on the image content, so repeated or identical
+    frames in a batch skip the histogram pass.
+
+    Parameters
+    ----------
+    img_array : numpy.ndarray
+        Contiguous uint8 grayscale image.
+    minimum_percentil, maximum_percentil : int
+        Lower and upper percentile bounds.
+    sample_large : bool
+        Allow the sampled estimate for large images (metrics-only runs).
+
+    Returns
+    -------
+    tuple
+        `(p_min, p_max, p50, p0, p100, hist, cdf)`. The arrays are shared with the cache and
+        must not be modified by the caller; `hist` and `cdf` are None for sampled images.
+    """
+    sample_large = sample_large and img_array.size > _PERCENTILE_SAMPLE_THRESHOLD
+    key = (_image_fingerprint(img_array), minimum_percentil, maximum_percentil, sample_large)
+    cached = _GLOBAL_STATS_CACHE.get(key)
+    if cached is not None:
+        return cached
+
+    if sample_large:
+        # Large image: percentiles from a strided sample, exact extremes from min/max reductions
+        step = img_array.size // _PERCENTILE_SAMPLE_SIZE
+        while np.gcd(step, img_array.shape[1]) != 1:
+            step += 1
+        sample_cdf = np.cumsum(np.bincount(img_array.ravel()[::step], minlength=256))
+        p0 = img_array.min()
+        p100 = img_array.max()
+        # 0 and 100 are the exact extremes; other estimates are kept inside [P0, P100]
+        p_min, p_max, p50 = [
+            np.float64(p0) if q == 0 else np.float64(p100) if q == 100
+            else np.clip(_percentile_from_cdf(sample_cdf, q), p0, p100)
+            for q in (minimum_percentil, maximum_percentil, 50)
+        ]
+        hist = cdf = None
+    else:
+        # 8-bit image: one linear pass builds the 256-bin histogram, whose CDF gives
+        # exact percentiles (no sort) and is reused by the histogram panel (Object 2)
+        hist = np.bincount(img_array.ravel(), minlength=256)
+        cdf = np.cumsum(hist)
+        p_min = _percentile_from_cdf(cdf, minimum_percentil)
+        p_max = _percentile_from_cdf(cdf, maximum_percentil)
+        p50 = _percentile_from_cdf(cdf, 50)
+        occupied_levels = hist.nonzero()[0]
+        p0 = occupied_levels[0]
+        p100 = occupied_levels[-1]
+
+    stats = (p_min, p_max, p50, p0, p100, hist, cdf)
+    with _GLOBAL_STATS_LOCK:
+        _GLOBAL_STATS_CACHE[key] = stats
+        if len(_GLOBAL_STATS_CACHE) > _GLOBAL_STATS_CACHE_SIZE:
+            _GLOBAL_STATS_CACHE.popitem(last=False)
+    return stats
+
+if njit is not None:
+    @njit(cache=True)
+    def _order_statistic(cdf, k):
+        r"""
+        k-th smallest value (0-based) of 8-bit data from its cumulative 256-bin count.
+        """
+        for value in range(256):
+            if cdf[value] > k:
+                return value
+        return 255
+
+    @njit(cache=True)
+    def _row_statistics(img, i, q_min, q_max, zone_lut, out_zones,
+                        out_p_min, out_p_max, out_median, out_p0, out_p100):
+        r"""
+        Fused per-row body: a single pass over the pixels of row `i` fills its overlay zone row
+        (lookup table) and a local 256-bin histogram; the five row statistics are then read
+        from its cumulative count (counting sort, no comparison sort).
+
+        Percentiles use the same linear interpolation as `np.percentile`.
+        """
+        width = img.shape[1]
+        cdf = np.zeros(256, dtype=np.int64)
+        for j in range(width):
+            value = img[i, j]
+            cdf[value] += 1
+            out_zones[i, j] = zone_lut[value]
+        for value in range(1, 256):
+            cdf[value] += cdf[value - 1]
+
+        out_p0[i] = _order_statistic(cdf, 0)
+        out_p100[i] = _order_statistic(cdf, width - 1)
+
+        for k in range(3):
+            q = q_min if k == 0 else (50.0 if k == 1 else q_max)
+            position = (q / 100.0) * (width - 1)
+            lower = int(np.floor(position))
+            upper = min(lower + 1, width - 1)
+            fraction = position - lower
+            low_val = np.float64(_order_statistic(cdf, lower))
+            high_val = np.float64(_order_statistic(cdf, upper))
+            diff = high_val - low_val
+            if fraction >= 0.5:
+                value = high_val - diff * (1.0 - fraction)
+            else:
+                value = low_val + diff * fraction
+            if k == 0:
+                out_p_min[i] = value
+            elif k == 1:
+                out_median[i] = value
+            else:
+                out_p_max[i] = value
+
+    @njit(parallel=True, nogil=True, cache=True)
+    def _row_statistics_kernel(img, q_min, q_max, zone_lut, out_zones,
+                               out_p_min, out_p_max, out_median, out_p0, out_p100):
+        r"""
+        Row statistics with the rows spread over numba's thread pool (`prange`).
+        """
+        for i in prange(img.shape[0]):
+            _row_statistics(img, i, q_min, q_max, zone_lut, out_zones,
+                            out_p_min, out_p_max, out_median, out_p0, out_p100)
+
+    @njit(nogil=True, cache=True)
+    def _row_statistics_kernel_serial(img, q_min, q_max, zone_lut, out_zones,
+                                      out_p_min, out_p_max, out_median, out_p0, out_p100):
+        r"""
+        Row statistics on the calling thread only (no numba thread pool), for worker threads.
+        """
+        for i in range(img.shape[0]):
+            _row_statistics(img, i, q_min, q_max, zone_lut, out_zones,
+                            out_p_min, out_p_max, out_median, out_p0, out_p100)
+
+def _overlay_and_row_statistics(img_array, zone_lut, minimum_percentil, maximum_percentil):
+    r"""
+    Applies the overlay zone lookup table and computes the per-row intensity statistics.
+
+    Uses the fused Numba kernel when numba is installed, otherwise the vectorized NumPy path
+    (one multi-kth `np.partition` per row and a single gather of the percentile columns).
+    The row-parallel kernel only runs on the main thread: numba's thread pool must not be
+    entered concurrently (the workqueue layer aborts) nor started from another thread (the
+    TBB layer can hang at interpreter exit). Worker threads, which already split a batch by
+    image, use the single-threaded kernel.
+
+    Returns
+    -------
+    tuple
+        `(overlay_zones, row_p_min, row_median, row_p_max, row_p0, row_p100)`.
+    """
+    if njit is not None:
+        height, width = img_array.shape
+        overlay_zones = np.empty((height, width), dtype=np.uint8)
+        row_p_min = np.empty(height)
+        row_median = np.empty(height)
+        row_p_max = np.empty(height)
+        row_p0 = np.empty(height, dtype=np.uint8)
+        row_p100 = np.empty(height, dtype=np.uint8)
+        if threading.current_thread() is threading.main_thread():
+            kernel = _row_statistics_kernel
+        else:
+            kernel = _row_statistics_kernel_serial
+        kernel(img_array, float(minimum_percentil), float(maximum_percentil), zone_lut,
+               overlay_zones, row_p_min, row_p_max, row_median, row_p0, row_p100)
+        return overlay_zones, row_p_min, row_median, row_p_max, row_p0, row_p100
+
+    overlay_zones = zone_lut[img_array]
+    # One partition per row places every needed order statistic (P0, P100 and the neighbours
+    # of P_min, P50, P_max) without fully sorting; the percentile columns are gathered in one pass
+    width = img_array.shape[1]
+    row_percentiles = [minimum_percentil, 50, maximum_percentil]
+    _, lower, upper = _percentile_indices(width, row_percentiles)
+    kth = np.unique(np.concatenate(([0, width - 1], lower, upper)))
+    partitioned_rows = np.partition(img_array, kth, axis=1)
+    row_p_min, row_median, row_p_max = _percentile_from_sorted(partitioned_rows, row_percentiles)
+    return overlay_zones, row_p_min, row_median, row_p_max, partitioned_rows[:, 0], partitioned_rows[:, -1]
+
+def _load_rgb(img_path):
+    r"""
+    Decodes an image file as an (H, W, 3) uint8 RGB array.
+
+    Plain 8-bit grayscale and RGB files are decoded with OpenCV when available; every other
+    mode (CMYK, 16-bit, palette, alpha, ...) goes through PIL, as does any file cv2 cannot
+    read, because OpenCV converts those modes differently. The pixels, and therefore the
+    metrics, do not depend on which decoder is installed. EXIF orientation is ignored on
+    both paths.
+    """
+    with Image.open(img_path) as img:
+        if cv2 is not None and img.mode in ('L', 'RGB'):
+            bgr = cv2.imread(img_path, cv2.IMREAD_COLOR | cv2.IMREAD_IGNORE_ORIENTATION)
+            if bgr is not None:
+                return cv2.cvtColor(bgr, cv2.COLOR_BGR2RGB)
+
+        # RGB files are used as decoded (`convert` would duplicate the pixel buffer)
+        img_rgb = img if img.mode == 'RGB' else img.convert('RGB')
+        rgb_array = np.asarray(img_rgb)
+    return rgb_array
+
+def _compute_metrics(img_path, minimum_percentil, maximum_percentil, sample_large=False):
+    r"""
+    Decodes one image and computes every statistic used by the results and the plots.
+
+    Parameters
+    ----------
+    img_path : str
+        Image file path.
+    minimum_percentil, maximum_percentil : int
+        Lower and upper percentile bounds.
+    sample_large : bool
+        Estimate the global percentiles of large images from a sample (see `_global_statistics`);
+        only for metrics-only runs, since the plots need the full histogram anyway.
+
+    Returns
+    -------
+    dict
+        Arrays (RGB, grayscale, overlay zones, histogram, row profiles) and scalar metrics.
+    """
+    img_rgb = _load_rgb(img_path)
+    # Grayscale derived from the decoded RGB pixels (no second decode) with PIL's RGB -> L
+    img_array = np.asarray(Image.fromarray(img_rgb).convert('L'))
+
+    # --- GLOBAL CALCULATIONS ---
+    p_min, p_max, p50, p0, p100, hist, cdf = _global_statistics(img_array, minimum_percentil, maximum_percentil,
+                                                                sample_large)
+
+    contrast_mid_global = (abs(p_max - p_min) / 255.0) * 100
+    contrast_shadow_global = (abs(p_min - p0) / 255.0) * 100
+    contrast_highlight_global = (abs(p100 - p_max) / 255.0) * 100
+
+    # --- OVERLAY IMAGE GENERATION ---
+    # 256-entry intensity -> zone lookup table, applied with a single gather (no masks).
+    # One byte per pixel; the colours are only applied when drawing on top of the grayscale image.
+    zone_lut = np.zeros(256, dtype=np.uint8)
+    # Low Intensity (Shadows, pixel < P_min) -> Dark Red
+    zone_lut[:int(np.ceil(p_min))] = _ZONE_SHADOW
+    # High Intensity (Highlights, pixel > P_max) -> Light Red
+    zone_lut[int(np.floor(p_max)) + 1:] = _ZONE_HIGHLIGHT
+
+    # --- ROW-WISE CALCULATIONS ---
+    overlay_zones, row_p_min, row_median, row_p_max, row_p0, row_p100 = _overlay_and_row_statistics(
+        img_array, zone_lut, minimum_percentil, maximum_percentil)
+
+    # Central differences (one-sided at the edges), same values as np.gradient for unit spacing
+    gradient_profile = np.empty_like(row_median)
+    gradient_profile[1:-1] = (row_median[2:] - row_median[:-2]) * 0.5
+    gradient_profile[0] = row_median[1] - row_median[0]
+    gradient_profile[-1] = row_median[-1] - row_median[-2]
+
+    # All three row contrasts in one stacked array: a single abs, argmax and gather
+    row_diffs = np.abs(np.stack((row_p_max - row_p_min, row_p_min - row_p0, row_p100 - row_p_max)))
+    max_rows = row_diffs.argmax(axis=1)
+    max_vals = (row_diffs[np.arange(3), max_rows] / 255.0) * 100
+    max_contrast_mid_val, max_contrast_shadow_val, max_contrast_highlight_val = max_vals
+    max_contrast_mid_h, max_contrast_shadow_h, max_contrast_highlight_h = max_rows
+
+    return {
+        'img_rgb': img_rgb, 'img_array': img_array, 'overlay_zones': overlay_zones,
+        'hist': hist, 'cdf': cdf,
+        'p_min': p_min, 'p_max': p_max, 'p50': p50,
+        'contrast_mid_global': contrast_mid_global,
+        'contrast_shadow_global': contrast_shadow_global,
+        'contrast_highlight_global': contrast_highlight_global,
+        'row_p_min': row_p_min, 'row_p_max': row_p_max, 'row_median': row_median,
+        'gradient_profile': gradient_profile,
+        'max_contrast_mid_val': max_contrast_mid_val, 'max_contrast_mid_h': max_contrast_mid_h,
+        'max_contrast_shadow_val': max_contrast_shadow_val, 'max_contrast_shadow_h': max_contrast_shadow_h,
+        'max_contrast_highlight_val': max_contrast_highlight_val, 'max_contrast_highlight_h': max_contrast_highlight_h
+    }
+
+def _result_entry(metrics):
+    r"""
+    Builds the results dictionary entry of one image from its `_compute_metrics` output.
+    """
+    return {
+        'p_min_val': metrics['p_min'], 'p_max_val': metrics['p_max'], 'p50_val': metrics['p50'],
+        'contrast_mid_global': metrics['contrast_mid_global'],
+        'max_contrast_mid_local': metrics['max_contrast_mid_val'],
+        'max_contrast_mid_height': metrics['max_contrast_mid_h']
+    }
+
+def _result_entry_from_file(img_path, mtime_ns, size, minimum_percentil, maximum_percentil, cache_version):
+    r"""
+    Results entry of one image, the unit stored by the caches (`_cached_result_entry`).
+
+    Only the small results entry is cached, never the image arrays. `mtime_ns`, `size` and
+    `cache_version` are not used in the calculations; they only make the cache key change
+    whenever the file or the numerical pipeline (`_CACHE_VERSION`) is modified.
+    """
+    return _result_entry(_compute_metrics(img_path, minimum_percentil, maximum_percentil, sample_large=True))
+
+@functools.lru_cache(maxsize=1)
+def _disk_cache():
+    r"""
+    `_result_entry_from_file` wrapped in a joblib disk cache in `_CACHE_DIR`, created on first use.
+
+    Falls back to the uncached function when joblib is not installed or the cache directory
+    cannot be created, leaving only the in-memory cache.
+    """
+    if Memory is not None:
+        try:
+            return Memory(_CACHE_DIR, verbose=0).cache(_result_entry_from_file)
+        except OSError:
+            pass
+    return _result_entry_from_file
+
+@functools.lru_cache(maxsize=32)
+def _cached_result_entry(img_path, mtime_ns, size, minimum_percentil, maximum_percentil, cache_version):
+    r"""
+    Results entry of one image, memoized in memory and, when `joblib` is installed, on disk
+    (`_disk_cache`), so unchanged files are not reprocessed across calls or sessions.
+    """
+    return _disk_cache()(img_path, mtime_ns, size, minimum_percentil, maximum_percentil, cache_version)
+
+def _summarize(img_path, minimum_percentil, maximum_percentil):
+    r"""
+    Computes (or fetches from cache) the results entry of one image, without plotting data.
+
+    Returns
+    -------
+    tuple
+        `(file_name, result_entry)`: the key and value stored in the results dictionary.
+    """
+    file_stat = os.stat(img_path)
+    result_entry = _cached_result_entry(os.path.abspath(img_path), file_stat.st_mtime_ns, file_stat.st_size,
+                                        minimum_percentil, maximum_percentil, _CACHE_VERSION)
+    # Copy: the cached dict must not be shared with (and modified through) the caller's results
+    return os.path.basename(img_path), dict(result_entry)
+
+def _image_summary(img_path, minimum_percentil, maximum_percentil):
+    r"""
+    Worker-pool task used when `show_plots=False`.
+
+    Only the small results entry is returned (not the image arrays). Errors are returned as
+    messages rather than printed, so they are reported in the order of `image_paths`.
+
+    Returns
+    -------
+    tuple
+        `(file_name, result_entry, None)` on success, `(None, None, message)` on failure.
+    """
+    if not os.path.exists(img_path):
+        return None, None, f"Error: File not found at {img_path}"
+    try:
+        file_name, result_entry = _summarize(img_path, minimum_percentil, maximum_percentil)
+        return file_name, result_entry, None
+    except Exception as e:
+        return None, None, f"Error processing {img_path}: {e}"
+
 def image_classification_for_hsp_method_v01_63(
     image_paths,
     show_plots=True,
@@ -30,6 +534,12 @@ def image_classification_for_hsp_method_v01_63(
     Core Logic and Rules
     --------------------
     1. **Preprocessing**: Loads images in RGB and Gray. Creates a 3rd "Overlay" image matrix based on percentile thresholds.
+       - **Large images** (> 1,000,000 pixels, `show_plots=False` only): the global $P_{min}$, $P_{50}$ and $P_{max}$ are estimated from a
+         strided sample of ~200,000 pixels (clamped to the exact $[P_0, P_{100}]$ range; a bound of 0 or 100 uses
+         the exact extreme). $P_0$, $P_{100}$,
+         the histogram (Object 2), the overlay masks and all row-wise statistics remain exact.
+       - **Batch mode**: with `show_plots=False` and several images, the images are processed in parallel
+         (`ThreadPoolExecutor`); results and messages keep the order of `image_paths`.
     2. **User Parameters**:
        - `minimum_percentil` ($P_{min}$): Default 10. Range [0, 50).
        - `maximum_percentil` ($P_{max}$): Default 90. Range (50, 100].
@@ -119,226 +629,227 @@ def image_classification_for_hsp_method_v01_63(
             print(f"Instruction for User: 'maximum_pixel_intensity_for_class_{i}' must be between 0 and 255. You provided {th}.")
             return {}
 
+    if show_plots:
+        # Imported lazily: runs with `show_plots=False` never load pyplot or a GUI backend
+        import matplotlib.pyplot as plt
+        from matplotlib.colors import ListedColormap
+        from matplotlib.collections import LineCollection
+        from matplotlib.lines import Line2D
+
     results = {}
 
+    if not show_plots and len(image_paths) > 1:
+        # Metrics only: images are independent, so the batch is spread over a worker pool
+        with ThreadPoolExecutor() as executor:
+            summaries = executor.map(_image_summary, image_paths, repeat(minimum_percentil),
+                                     repeat(maximum_percentil))
+            for file_name, result_entry, message in summaries:
+                if message is not None:
+                    print(message)
+                    continue
+                results[file_name] = result_entry
+        return results
+
+    # Figures of the whole batch, displayed together by a single plt.show() after the loop
+    figures = []
+
     for img_path in image_paths:
         try:
             if not os.path.exists(img_path):
                 print(f"Error: File not found at {img_path}")
                 continue
 
-            with Image.open(img_path) as img:
-                img_rgb = img.convert('RGB')
-                img_gray = img.convert('L')
-                img_array = np.array(img_gray)
-
-            # --- GLOBAL CALCULATIONS ---
-            p_min = np.percentile(img_array, minimum_percentil)
-            p_max = np.percentile(img_array, maximum_percentil)
-            p50 = np.percentile(img_array, 50)
-            p0 = np.min(img_array)
-            p100 = np.max(img_array)
-
-            contrast_mid_global = (abs(p_max - p_min) / 255.0) * 100
-            contrast_shadow_global = (abs(p_min - p0) / 255.0) * 100
-            contrast_highlight_global = (abs(p100 - p_max) / 255.0) * 100
-
-            # --- OVERLAY IMAGE GENERATION ---
-            img_overlay = np.stack((img_array,)*3, axis=-1)
-            mask_low = img_array < p_min
-            mask_high = img_array > p_max
-
-            # Low Intensity (Shadows) -> Dark Red
-            img_overlay[mask_low] = [139, 0, 0]
-            # High Intensity (Highlights) -> Light Red
-            img_overlay[mask_high] = [255, 100, 100]
-
-            # --- ROW-WISE CALCULATIONS ---
-            row_median = np.median(img_array, axis=1)
-            row_p_min = np.percentile(img_array, minimum_percentil, axis=1)
-            row_p_max = np.percentile(img_array, maximum_percentil, axis=1)
-            row_p0 = np.min(img_array, axis=1)
-            row_p100 = np.max(img_array, axis=1)
-
-            gradient_profile = np.gradient(row_median)
-
-            row_contrast_mid_arr = (np.abs(row_p_max - row_p_min) / 255.0) * 100
-            max_contrast_mid_val = np.max(row_contrast_mid_arr)
-            max_contrast_mid_h = np.argmax(row_contrast_mid_arr)
-
-            row_contrast_shadow_arr = (np.abs(row_p_min - row_p0) / 255.0) * 100
-            max_contrast_shadow_val = np.max(row_contrast_shadow_arr)
-            max_contrast_shadow_h = np.argmax(row_contrast_shadow_arr)
-
-            row_contrast_highlight_arr = (np.abs(row_p100 - row_p_max) / 255.0) * 100
-            max_contrast_highlight_val = np.max(row_contrast_highlight_arr)
-            max_contrast_highlight_h = np.argmax(row_contrast_highlight_arr)
+            if not show_plots:
+                file_name, result_entry = _summarize(img_path, minimum_percentil, maximum_percentil)
+                results[file_name] = result_entry
+                continue
 
             file_name = os.path.basename(img_path)
-            results[file_name] = {
-                'p_min_val': p_min, 'p_max_val': p_max, 'p50_val': p50,
-                'contrast_mid_global': contrast_mid_global,
-                'max_contrast_mid_local': max_contrast_mid_val,
-                'max_contrast_mid_height': max_contrast_mid_h
-            }
-
-            if show_plots:
-                # =========================================================
-                # OBJECT 1: 3 IMAGES + VERTICAL PROFILE
-                # =========================================================
-                # UPDATED v01.63: Set height to 6 to match Object 2. Adjusted width ratio.
-                fig1 = plt.figure(figsize=(20, 6), layout='constrained')
-                # Pixel ratios [82, 82, 82, 255] ensure correct width proportions
-                gs1 = fig1.add_gridspec(1, 4, width_ratios=[82, 82, 82, 255], wspace=0.0)
-                fig1.suptitle(f'Object 1 - Vertical Profile Analysis: {file_name}', fontsize=14)
-
-                # --- 1A: Original RGB ---
-                ax_img1 = fig1.add_subplot(gs1[0])
-                # UPDATED v01.63: Removed anchor='E' for better seamless gluing
-                ax_img1.imshow(img_rgb, aspect='auto')
-                ax_img1.set_xticks([])
-                ax_img1.set_yticks([])
-                ax_img1.set_title("Original RGB", fontsize=10, pad=5)
-                for spine in ax_img1.spines.values(): spine.set_visible(False)
-
-                # --- 1B: Grayscale ---
-                ax_img2 = fig1.add_subplot(gs1[1])
-                # UPDATED v01.63: Removed anchor='E'
-                ax_img2.imshow(img_array, cmap='gray', vmin=0, vmax=255, aspect='auto')
-                ax_img2.set_xticks([])
-                ax_img2.set_yticks([])
-                ax_img2.set_title("Grayscale Image", fontsize=10, pad=5)
-                for spine in ax_img2.spines.values(): spine.set_visible(False)
-
-                # --- 1C: Overlay (Red Zones) ---
-                ax_img3 = fig1.add_subplot(gs1[2])
-                # UPDATED v01.63: Removed anchor='E'
-                ax_img3.imshow(img_overlay, aspect='auto')
-                ax_img3.set_xticks([])
-                ax_img3.set_yticks([])
-                ax_img3.set_title("Contrast Overlay", fontsize=10, pad=5)
-                for spine in ax_img3.spines.values(): spine.set_visible(False)
-
-                # --- 1D: Vertical Profile Graph ---
-                ax_prof = fig1.add_subplot(gs1[3])
-                heights = np.arange(len(row_median))
-                img_height_px = img_array.shape[0]
-
-                # Axis Config - STRICT BLUE ENFORCEMENT
-                ax_prof.set_xlabel("Pixel Intensity", color='blue')
-                ax_prof.tick_params(axis='x', labelcolor='blue', colors='blue')
-                ax_prof.spines['bottom'].set_color('blue')
-                ax_prof.spines['bottom'].set_linewidth(1.5)
-
-                ax_prof.set_xlim(0, 255)
-                ax_prof.set_ylim(img_height_px - 0.5, -0.5)
-                ax_prof.set_ylabel("Height (px)", color='black')
-                ax_prof.yaxis.set_label_position("right")
-                ax_prof.yaxis.tick_right()
-                ax_prof.tick_params(axis='y', labelcolor='black', colors='black')
-
-                ax_grad = ax_prof.twiny()
-                ax_grad.set_xlabel(f"P50 Derivative", color='red')
-                ax_grad.tick_params(axis='x', labelcolor='red', colors='red')
-                ax_grad.spines['top'].set_color('red')
-
-                ax_prof.xaxis.grid(True, linestyle='--', linewidth=0.5, color='black', alpha=0.3, zorder=0)
-                ax_prof.yaxis.grid(True, linestyle='--', linewidth=0.5, color='black', alpha=0.3, zorder=0)
-
-                # Plotting Curves
-                ax_prof.plot(row_p_min, heights, color='blue', linestyle='--', linewidth=1, zorder=98, label=f'P{minimum_percentil} / P{maximum_percentil}')
-                ax_prof.plot(row_p_max, heights, color='blue', linestyle='--', linewidth=1, zorder=98)
-                ax_prof.plot(row_median, heights, color='blue', linestyle='-', linewidth=2, zorder=98, label='P50')
-                ax_grad.plot(gradient_profile, heights, color='red', linestyle='-', linewidth=1.5, zorder=99, label='P50 Derivative')
-
-                # Legend Construction
-                legend_label = (
-                    f"----\n"
-                    f"Max Contrast(|P{maximum_percentil} - P{minimum_percentil}|) = ({max_contrast_mid_h}px, {max_contrast_mid_val:.1f}%)\n"
-                    f"Max Contrast(|P{minimum_percentil} - P0|) = ({max_contrast_shadow_h}px, {max_contrast_shadow_val:.1f}%)\n"
-                    f"Max Contrast(|P100 - P{maximum_percentil}|) = ({max_contrast_highlight_h}px, {max_contrast_highlight_val:.1f}%)"
-                )
-                ax_prof.plot([], [], ' ', label=legend_label)
-
-                # Legend Order
-                lines_1, labels_1 = ax_prof.get_legend_handles_labels()
-                lines_2, labels_2 = ax_grad.get_legend_handles_labels()
-                final_lines = [lines_1[0], lines_1[1], lines_2[0], lines_1[2]]
-                final_labels = [labels_1[0], labels_1[1], labels_2[0], labels_1[2]]
-
-                leg1 = ax_grad.legend(final_lines, final_labels, loc='upper right',
-                               fontsize='small', framealpha=1, facecolor='white', edgecolor='black', frameon=True)
-                leg1.set_zorder(101)
-
-                ax_prof.set_title(f"Vertical Profile Intensity", pad=35)
-                plt.show()
-
-                # =========================================================
-                # OBJECT 2: HISTOGRAM
-                # =========================================================
-                # UPDATED v01.63: Set height to 6 to match Object 1.
-                fig2 = plt.figure(figsize=(7.5, 6), layout='constrained')
-                ax_hist = fig2.add_subplot(111)
-                fig2.suptitle(f'Object 2 - Histogram Analysis: {file_name}', fontsize=14)
-
-                ax_hist.set_xlabel("Pixel Intensity", color='black')
-                ax_hist.tick_params(axis='x', colors='black')
-                ax_hist.set_xlim(0, 255)
-                ax_hist.set_ylabel("Pixel Count", color='black')
-                ax_hist.tick_params(axis='y', colors='black')
-
-                ax_cum = ax_hist.twinx()
-                ax_cum.set_ylabel("Cumulative Percentage (%)", color='red')
-                ax_cum.tick_params(axis='y', labelcolor='red', colors='red')
-                ax_cum.spines['right'].set_color('red')
-                ax_cum.set_yticks(np.arange(0, 101, 10))
-                ax_cum.set_ylim(0, 105)
-
-                n, bins, patches = ax_hist.hist(img_array.ravel(), bins=256, range=(0, 256),
-                                              color='lightgray', edgecolor='none', density=False, label='Pixel Count', zorder=97)
-
-                cdf = np.cumsum(n)
-                cdf_normalized = (cdf / cdf[-1]) * 100
-                bin_centers = (bins[:-1] + bins[1:]) / 2
-
-                ax_cum.plot(bin_centers, cdf_normalized, color='red', linestyle='-', linewidth=2, label='Percentil', zorder=99)
-
-                class_thresholds = [maximum_pixel_intensity_for_class_1, maximum_pixel_intensity_for_class_2,
-                                    maximum_pixel_intensity_for_class_3, maximum_pixel_intensity_for_class_4]
-                for th in class_thresholds:
-                    ax_hist.axvline(th, color='blue', linestyle='-', linewidth=1.5, zorder=98)
-
-                ax_hist.axvline(p50, color='darkgreen', linestyle='--', linewidth=2.5, zorder=98, label='P50')
-                ax_hist.axvline(p_min, color='darkgreen', linestyle='--', linewidth=1, zorder=98, label=f'P{minimum_percentil} / P{maximum_percentil}')
-                ax_hist.axvline(p_max, color='darkgreen', linestyle='--', linewidth=1, zorder=98)
-
-                ax_hist.xaxis.grid(True, linestyle='--', linewidth=0.5, color='black', alpha=0.3, zorder=0)
-                ax_cum.yaxis.grid(True, linestyle='--', linewidth=0.5, color='black', alpha=0.3, zorder=0)
-
-                legend_stats = (
-                    f"----\n"
-                    f"Contrast(|P{maximum_percentil} - P{minimum_percentil}|): {contrast_mid_global:.1f}%\n"
-                    f"Contrast(|P{minimum_percentil} - P0|): {contrast_shadow_global:.1f}%\n"
-                    f"Contrast(|P100 - P{maximum_percentil}|): {contrast_highlight_global:.1f}%"
-                )
-                ax_hist.plot([], [], ' ', label=legend_stats)
-
-                lines_h, labels_h = ax_hist.get_legend_handles_labels()
-                lines_c, labels_c = ax_cum.get_legend_handles_labels()
-
-                final_lines_2 = [lines_h[0], lines_h[1], lines_h[2], lines_c[0], lines_h[3]]
-                final_labels_2 = [labels_h[0], labels_h[1], labels_h[2], labels_c[0], labels_h[3]]
-
-                leg2 = ax_cum.legend(final_lines_2, final_labels_2, loc='upper right',
-                               framealpha=1, facecolor='white', edgecolor='black', fontsize='small', frameon=True)
-                leg2.set_zorder(101)
-
-                ax_hist.set_title("Pixel Intensity histogram (Count vs. Intensity)")
-
-                plt.show()
+            metrics = _compute_metrics(img_path, minimum_percentil, maximum_percentil)
+            results[file_name] = _result_entry(metrics)
+            img_rgb, img_array, overlay_zones = metrics['img_rgb'], metrics['img_array'], metrics['overlay_zones']
+            hist, cdf = metrics['hist'], metrics['cdf']
+            p_min, p_max, p50 = metrics['p_min'], metrics['p_max'], metrics['p50']
+            contrast_mid_global = metrics['contrast_mid_global']
+            contrast_shadow_global = metrics['contrast_shadow_global']
+            contrast_highlight_global = metrics['contrast_highlight_global']
+            row_p_min, row_p_max, row_median = metrics['row_p_min'], metrics['row_p_max'], metrics['row_median']
+            gradient_profile = metrics['gradient_profile']
+            max_contrast_mid_val, max_contrast_mid_h = metrics['max_contrast_mid_val'], metrics['max_contrast_mid_h']
+            max_contrast_shadow_val, max_contrast_shadow_h = metrics['max_contrast_shadow_val'], metrics['max_contrast_shadow_h']
+            max_contrast_highlight_val, max_contrast_highlight_h = metrics['max_contrast_highlight_val'], metrics['max_contrast_highlight_h']
+
+            # =========================================================
+            # OBJECT 1: 3 IMAGES + VERTICAL PROFILE
+            # =========================================================
+            # UPDATED v01.63: Set height to 6 to match Object 2. Adjusted width ratio.
+            fig1 = plt.figure(figsize=(20, 6), layout='constrained')
+            figures.append(fig1)
+            # Pixel ratios [82, 82, 82, 255] ensure correct width proportions
+            gs1 = fig1.add_gridspec(1, 4, width_ratios=[82, 82, 82, 255], wspace=0.0)
+            fig1.suptitle(f'Object 1 - Vertical Profile Analysis: {file_name}', fontsize=14)
+
+            # --- 1A: Original RGB ---
+            ax_img1 = fig1.add_subplot(gs1[0])
+            # UPDATED v01.63: Removed anchor='E' for better seamless gluing
+            ax_img1.imshow(img_rgb, aspect='auto')
+            ax_img1.set_xticks([])
+            ax_img1.set_yticks([])
+            ax_img1.set_title("Original RGB", fontsize=10, pad=5)
+            for spine in ax_img1.spines.values(): spine.set_visible(False)
+
+            # --- 1B: Grayscale ---
+            ax_img2 = fig1.add_subplot(gs1[1])
+            # UPDATED v01.63: Removed anchor='E'
+            ax_img2.imshow(img_array, cmap='gray', vmin=0, vmax=255, aspect='auto')
+            ax_img2.set_xticks([])
+            ax_img2.set_yticks([])
+            ax_img2.set_title("Grayscale Image", fontsize=10, pad=5)
+            for spine in ax_img2.spines.values(): spine.set_visible(False)
+
+            # --- 1C: Overlay (Red Zones) ---
+            ax_img3 = fig1.add_subplot(gs1[2])
+            # UPDATED v01.63: Removed anchor='E'
+            # Grayscale base layer with only the two zones painted on top (zone 0 is masked out)
+            ax_img3.imshow(img_array, cmap='gray', vmin=0, vmax=255, aspect='auto')
+            ax_img3.imshow(np.ma.masked_equal(overlay_zones, _ZONE_NONE), cmap=ListedColormap(_ZONE_COLORS),
+                           vmin=_ZONE_SHADOW, vmax=_ZONE_HIGHLIGHT, aspect='auto')
+            ax_img3.set_xticks([])
+            ax_img3.set_yticks([])
+            ax_img3.set_title("Contrast Overlay", fontsize=10, pad=5)
+            for spine in ax_img3.spines.values(): spine.set_visible(False)
+
+            # --- 1D: Vertical Profile Graph ---
+            ax_prof = fig1.add_subplot(gs1[3])
+            heights = np.arange(len(row_median))
+            img_height_px = img_array.shape[0]
+
+            # Axis Config - STRICT BLUE ENFORCEMENT
+            ax_prof.set_xlabel("Pixel Intensity", color='blue')
+            ax_prof.tick_params(axis='x', labelcolor='blue', colors='blue')
+            ax_prof.spines['bottom'].set_color('blue')
+            ax_prof.spines['bottom'].set_linewidth(1.5)
+
+            ax_prof.set_xlim(0, 255)
+            ax_prof.set_ylim(img_height_px - 0.5, -0.5)
+            ax_prof.set_ylabel("Height (px)", color='black')
+            ax_prof.yaxis.set_label_position("right")
+            ax_prof.yaxis.tick_right()
+            ax_prof.tick_params(axis='y', labelcolor='black', colors='black')
+
+            ax_grad = ax_prof.twiny()
+            ax_grad.set_xlabel(f"P50 Derivative", color='red')
+            ax_grad.tick_params(axis='x', labelcolor='red', colors='red')
+            ax_grad.spines['top'].set_color('red')
+
+            ax_prof.xaxis.grid(True, linestyle='--', linewidth=0.5, color='black', alpha=0.3, zorder=0)
+            ax_prof.yaxis.grid(True, linestyle='--', linewidth=0.5, color='black', alpha=0.3, zorder=0)
+
+            # Plotting Curves
+            ax_prof.plot(row_p_min, heights, color='blue', linestyle='--', linewidth=1, zorder=98, label=f'P{minimum_percentil} / P{maximum_percentil}')
+            ax_prof.plot(row_p_max, heights, color='blue', linestyle='--', linewidth=1, zorder=98)
+            ax_prof.plot(row_median, heights, color='blue', linestyle='-', linewidth=2, zorder=98, label='P50')
+            ax_grad.plot(gradient_profile, heights, color='red', linestyle='-', linewidth=1.5, zorder=99, label='P50 Derivative')
+
+            # Legend Construction
+            legend_label = (
+                f"----\n"
+                f"Max Contrast(|P{maximum_percentil} - P{minimum_percentil}|) = ({max_contrast_mid_h}px, {max_contrast_mid_val:.1f}%)\n"
+                f"Max Contrast(|P{minimum_percentil} - P0|) = ({max_contrast_shadow_h}px, {max_contrast_shadow_val:.1f}%)\n"
+                f"Max Contrast(|P100 - P{maximum_percentil}|) = ({max_contrast_highlight_h}px, {max_contrast_highlight_val:.1f}%)"
+            )
+            ax_prof.plot([], [], ' ', label=legend_label)
+
+            # Legend Order
+            lines_1, labels_1 = ax_prof.get_legend_handles_labels()
+            lines_2, labels_2 = ax_grad.get_legend_handles_labels()
+            final_lines = [lines_1[0], lines_1[1], lines_2[0], lines_1[2]]
+            final_labels = [labels_1[0], labels_1[1], labels_2[0], labels_1[2]]
+
+            leg1 = ax_grad.legend(final_lines, final_labels, loc='upper right',
+                           fontsize='small', framealpha=1, facecolor='white', edgecolor='black', frameon=True)
+            leg1.set_zorder(101)
+
+            ax_prof.set_title(f"Vertical Profile Intensity", pad=35)
+
+            # =========================================================
+            # OBJECT 2: HISTOGRAM
+            # =========================================================
+            # UPDATED v01.63: Set height to 6 to match Object 1.
+            fig2 = plt.figure(figsize=(7.5, 6), layout='constrained')
+            figures.append(fig2)
+            ax_hist = fig2.add_subplot(111)
+            fig2.suptitle(f'Object 2 - Histogram Analysis: {file_name}', fontsize=14)
+
+            ax_hist.set_xlabel("Pixel Intensity", color='black')
+            ax_hist.tick_params(axis='x', colors='black')
+            ax_hist.set_xlim(0, 255)
+            ax_hist.set_ylabel("Pixel Count", color='black')
+            ax_hist.tick_params(axis='y', colors='black')
+
+            ax_cum = ax_hist.twinx()
+            ax_cum.set_ylabel("Cumulative Percentage (%)", color='red')
+            ax_cum.tick_params(axis='y', labelcolor='red', colors='red')
+            ax_cum.spines['right'].set_color('red')
+            ax_cum.set_yticks(_CUM_TICKS)
+            ax_cum.set_ylim(0, 105)
+
+            # Counts were already computed for the global percentiles (no second pass over the pixels)
+            # Bars are drawn edge-aligned on the same [i, i+1) bins `ax.hist(..., bins=256, range=(0, 256))` used.
+            ax_hist.bar(_BIN_EDGES_256[:-1], hist, width=1.0, align='edge',
+                        color='lightgray', edgecolor='none', label='Pixel Count', zorder=97)
+
+            cdf_normalized = (cdf / cdf[-1]) * 100
+
+            ax_cum.plot(_BIN_CENTERS_256, cdf_normalized, color='red', linestyle='-', linewidth=2, label='Percentil', zorder=99)
+
+            class_thresholds = [maximum_pixel_intensity_for_class_1, maximum_pixel_intensity_for_class_2,
+                                maximum_pixel_intensity_for_class_3, maximum_pixel_intensity_for_class_4]
+            # Class thresholds + P50/P_min/P_max markers as one artist. The x-axis transform
+            # (x in data, y in axes fraction) spans the full height like `axvline`.
+            marker_segments = [[(x, 0), (x, 1)] for x in class_thresholds + [p50, p_min, p_max]]
+            ax_hist.add_collection(LineCollection(
+                marker_segments, transform=ax_hist.get_xaxis_transform(), zorder=98,
+                colors=['blue'] * 4 + ['darkgreen'] * 3,
+                linestyles=['-'] * 4 + ['--'] * 3,
+                linewidths=[1.5] * 4 + [2.5, 1, 1]), autolim=False)
+            # Legend proxies for the P markers (the collection itself has no legend entry)
+            p50_proxy = Line2D([], [], color='darkgreen', linestyle='--', linewidth=2.5, label='P50')
+            p_range_proxy = Line2D([], [], color='darkgreen', linestyle='--', linewidth=1,
+                                   label=f'P{minimum_percentil} / P{maximum_percentil}')
+
+            ax_hist.xaxis.grid(True, linestyle='--', linewidth=0.5, color='black', alpha=0.3, zorder=0)
+            ax_cum.yaxis.grid(True, linestyle='--', linewidth=0.5, color='black', alpha=0.3, zorder=0)
+
+            legend_stats = (
+                f"----\n"
+                f"Contrast(|P{maximum_percentil} - P{minimum_percentil}|): {contrast_mid_global:.1f}%\n"
+                f"Contrast(|P{minimum_percentil} - P0|): {contrast_shadow_global:.1f}%\n"
+                f"Contrast(|P100 - P{maximum_percentil}|): {contrast_highlight_global:.1f}%"
+            )
+            ax_hist.plot([], [], ' ', label=legend_stats)
+
+            lines_h, labels_h = ax_hist.get_legend_handles_labels()
+            lines_c, labels_c = ax_cum.get_legend_handles_labels()
+
+            # The bar container is listed after the lines by matplotlib
+            final_lines_2 = [lines_h[1], p50_proxy, p_range_proxy, lines_c[0], lines_h[0]]
+            final_labels_2 = [labels_h[1], p50_proxy.get_label(), p_range_proxy.get_label(), labels_c[0], labels_h[0]]
+
+            leg2 = ax_cum.legend(final_lines_2, final_labels_2, loc='upper right',
+                           framealpha=1, facecolor='white', edgecolor='black', fontsize='small', frameon=True)
+            leg2.set_zorder(101)
+
+            ax_hist.set_title("Pixel Intensity histogram (Count vs. Intensity)")
 
         except Exception as e:
             print(f"Error processing {img_path}: {e}")
             continue
 
+    if figures:
+        # One event-loop pump for the whole batch instead of two blocking calls per image
+        plt.show()
+        for fig in figures:
+            plt.close(fig)
+
     return results